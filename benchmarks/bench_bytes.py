@@ -0,0 +1,95 @@
+"""
+Compara el camino anterior basado en `response.text` con el camino sobre bytes
+crudos: copias por página (memoria Python asignada / tamaño de la página) y
+tiempo, para una ficha y para la página del chart.
+
+Uso: python benchmarks/bench_bytes.py [repeticiones]
+"""
+import contextlib
+import io
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import requests
+from lxml.html import fromstring
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_extractores import pagina_de_prueba  # noqa: E402
+from extractores import extraer_campos, parsear_html  # noqa: E402
+from scraper import extraer_enlaces_imdb  # noqa: E402
+
+CHART = os.path.join(os.path.dirname(__file__), '..', 'data', 'imdb_debug.html')
+
+
+def respuesta(contenido):
+    # Respuesta sin Content-Type, como llegan algunas vía proxy: `.text` tiene
+    # que adivinar la codificación con charset_normalizer
+    response = requests.models.Response()
+    response.status_code = 200
+    response._content = contenido
+    return response
+
+
+def ficha_anterior(contenido):
+    texto = respuesta(contenido).text
+    return extraer_campos(fromstring(texto))
+
+
+def ficha_bytes(contenido):
+    return extraer_campos(parsear_html(respuesta(contenido).content))
+
+
+def chart_anterior(contenido, directorio):
+    html_path = os.path.join(directorio, 'chart.html')
+    with open(html_path, 'w', encoding='utf-8') as f:
+        f.write(respuesta(contenido).text)
+    with open(html_path, 'r', encoding='utf-8') as f:
+        texto = f.read()
+    return list(dict.fromkeys(re.findall(r'"url":"(https://www\.imdb\.com/title/tt\d+/)"', texto)))
+
+
+def chart_bytes(contenido, directorio):
+    html_path = os.path.join(directorio, 'chart.html')
+    with open(html_path, 'wb') as f:
+        f.write(respuesta(contenido).content)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return extraer_enlaces_imdb(html_path, os.path.join(directorio, 'enlaces.csv'))
+
+
+def medir(funcion, contenido, repeticiones, *args):
+    tracemalloc.start()
+    funcion(contenido, *args)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion(contenido, *args)
+    return (time.perf_counter() - inicio) / repeticiones * 1e3, pico / len(contenido)
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    ficha = pagina_de_prueba().encode('utf-8')
+    with open(CHART, 'rb') as f:
+        chart = f.read()
+
+    print(f"{'página':<22}{'camino':<10}{'tiempo (ms)':>13}{'copias':>9}")
+    with tempfile.TemporaryDirectory() as directorio:
+        casos = [
+            (f'ficha ({len(ficha) // 1024} KB)', ficha, ficha_anterior, ficha_bytes, ()),
+            (f'chart ({len(chart) // 1024} KB)', chart, chart_anterior, chart_bytes, (directorio,)),
+        ]
+        for nombre, contenido, anterior, nuevo, args in casos:
+            for camino, funcion in (('str', anterior), ('bytes', nuevo)):
+                tiempo, copias = medir(funcion, contenido, repeticiones, *args)
+                print(f"{nombre:<22}{camino:<10}{tiempo:>13.1f}{copias:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Micro-benchmarks por campo del registro de extractores frente a la extracción
+anterior (BeautifulSoup + re.search + XPath sin compilar).
+
+Uso: python benchmarks/bench_extractores.py [repeticiones]
+"""
+import os
+import re
+import sys
+import timeit
+
+from bs4 import BeautifulSoup
+from lxml.html import fromstring
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from extractores import CAMPOS, resolver_campo, XPATH_AÑO_ABSOLUTO  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'tests', 'fixtures', 'titulo_tt0111161.html')
+
+
+def pagina_de_prueba(relacionados=400):
+    """
+    Ficha de prueba inflada con carruseles y scripts para acercarse al tamaño real.
+    """
+    with open(FIXTURE, 'r', encoding='utf-8') as f:
+        contenido = f.read()
+    carrusel = ''.join(
+        f'<section><ul><li><a href="/title/tt{i:07d}/">Película {i}</a>'
+        f'<span>{i % 10}.{i % 7}</span><span>{i % 100}</span></li></ul></section>'
+        for i in range(relacionados)
+    )
+    script = '<script>' + 'var x = "' + 'a' * 200_000 + '";</script>'
+    return contenido.replace('<section class="sc-techspecs">', carrusel + '<section class="sc-techspecs">', 1) \
+        .replace('</body>', script + '</body>', 1)
+
+
+def metascore_anterior(soup):
+    for span in soup.select('section span'):
+        texto = span.get_text(strip=True)
+        if texto.isdigit():
+            valor = int(texto)
+            if 0 <= valor <= 100:
+                padre = span.find_parent('li')
+                if padre and 'Metascore' in padre.get_text():
+                    return valor
+    return None
+
+
+def duracion_anterior(soup):
+    duracion_text = soup.select_one('li[data-testid="title-techspec_runtime"]').get_text(strip=True)
+    horas = re.search(r'(\d+)h', duracion_text)
+    minutos = re.search(r'(\d+)m', duracion_text)
+    return int(horas.group(1)) * 60 + int(minutos.group(1))
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    contenido = pagina_de_prueba()
+    soup = BeautifulSoup(contenido, 'html.parser')
+    tree = fromstring(contenido)
+
+    anteriores = {
+        'titulo': lambda: soup.find('h1').get_text(strip=True),
+        'año': lambda: int(re.search(r'\d{4}', tree.xpath(XPATH_AÑO_ABSOLUTO)[0].text).group()),
+        'calificacion': lambda: float(soup.select_one(
+            '[data-testid="hero-rating-bar__aggregate-rating__score"] span').text),
+        'duracion_min': lambda: duracion_anterior(soup),
+        'metascore': lambda: metascore_anterior(soup),
+        'actores': lambda: [a.text for a in soup.select('li[data-testid="title-pc-principal-credit"]')[2]
+                            .select('a[href^="/name/"]')][:3],
+    }
+
+    print(f"Página de prueba: {len(contenido) / 1024:.0f} KB, {repeticiones} repeticiones por campo")
+    print(f"{'campo':<14}{'anterior (µs)':>16}{'registro (µs)':>16}{'mejora':>10}")
+    for nombre, campo in CAMPOS.items():
+        assert anteriores[nombre]() == resolver_campo(campo, tree)[0], nombre
+        t_anterior = timeit.timeit(anteriores[nombre], number=repeticiones) / repeticiones * 1e6
+        t_registro = timeit.timeit(lambda: resolver_campo(campo, tree), number=repeticiones) / repeticiones * 1e6
+        print(f"{nombre:<14}{t_anterior:>16.1f}{t_registro:>16.1f}{t_anterior / t_registro:>9.1f}x")
+
+    t_soup = timeit.timeit(lambda: BeautifulSoup(contenido, 'html.parser'), number=5) / 5 * 1e3
+    t_lxml = timeit.timeit(lambda: fromstring(contenido), number=5) / 5 * 1e3
+    print(f"\nParseo por página: BeautifulSoup + lxml {t_soup + t_lxml:.1f} ms, sólo lxml {t_lxml:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Compara HTTP/1.1 (requests, una conexión por petición) con el transporte HTTP/2
+compartido contra un servidor h2c local (hypercorn) que añade latencia fija a
+cada respuesta. Reporta tiempo total, latencia p50/p95, conexiones abiertas y
+conexiones cortadas por el servidor (la petición se reintenta).
+
+Requiere: pip install 'httpx[http2]' hypercorn
+Uso: python benchmarks/bench_http2.py [titulos] [latencia_ms]
+"""
+import asyncio
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from hypercorn.asyncio import serve
+from hypercorn.config import Config
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import scraper  # noqa: E402
+
+CUERPO = b'<html>' + b'x' * 50_000 + b'</html>'
+LATENCIA = 0.02
+# Trabajadores del pipeline en modo HTTP/2 (movies_scraper.HILOS_HTTP2)
+HILOS_HTTP2 = 32
+conexiones = set()
+
+
+async def app(scope, receive, send):
+    if scope['type'] != 'http':
+        return
+    conexiones.add(tuple(scope['client']))
+    await asyncio.sleep(LATENCIA)
+    await send({'type': 'http.response.start', 'status': 200,
+                'headers': [(b'content-type', b'text/html; charset=utf-8')]})
+    await send({'type': 'http.response.body', 'body': CUERPO})
+
+
+def iniciar_servidor():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        puerto = s.getsockname()[1]
+    config = Config()
+    config.bind = [f'127.0.0.1:{puerto}']
+    config.loglevel = 'WARNING'
+    loop = asyncio.new_event_loop()
+    apagar = asyncio.Event()
+    hilo = threading.Thread(
+        target=lambda: loop.run_until_complete(serve(app, config, shutdown_trigger=apagar.wait)), daemon=True)
+    hilo.start()
+    time.sleep(0.5)
+    return f'http://127.0.0.1:{puerto}', lambda: loop.call_soon_threadsafe(apagar.set)
+
+
+def medir(nombre, base, titulos, hilos):
+    conexiones.clear()
+    latencias = []
+    cortes = []
+
+    def descargar(i):
+        inicio = time.perf_counter()
+        while True:
+            try:
+                status_code, contenido = scraper.descargar(f'{base}/title/tt{i:07d}/', scraper.get_headers(),
+                                                           timeout=30)
+                break
+            except httpx.RemoteProtocolError:  # el servidor cerró la conexión (GOAWAY)
+                cortes.append(i)
+        assert status_code == 200 and len(contenido) == len(CUERPO)
+        latencias.append(time.perf_counter() - inicio)
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+        list(ejecutor.map(descargar, range(titulos)))
+    total = time.perf_counter() - inicio
+    latencias.sort()
+    p95 = latencias[int(len(latencias) * 0.95) - 1]
+    print(f"{nombre:<24}{hilos:>6}{total:>10.2f} s{statistics.median(latencias) * 1e3:>10.1f}{p95 * 1e3:>10.1f}"
+          f"{len(conexiones):>12}{len(cortes):>8}")
+
+
+def main():
+    global LATENCIA
+    titulos = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    if len(sys.argv) > 2:
+        LATENCIA = int(sys.argv[2]) / 1000
+    base, apagar = iniciar_servidor()
+
+    print(f"{titulos} títulos, latencia del servidor {LATENCIA * 1e3:.0f} ms")
+    print(f"{'transporte':<24}{'hilos':>6}{'total':>12}{'p50 (ms)':>10}{'p95 (ms)':>10}{'conexiones':>12}{'cortes':>8}")
+
+    scraper.use_http2 = False
+    medir('HTTP/1.1 (requests)', base, titulos, 10)
+
+    # h2c con conocimiento previo: el servidor local no tiene TLS/ALPN
+    scraper.use_http2 = True
+    scraper._cliente_http2 = httpx.Client(
+        http1=False, http2=True,
+        limits=httpx.Limits(max_connections=scraper.MAX_CONEXIONES_HTTP2,
+                            max_keepalive_connections=scraper.MAX_CONEXIONES_HTTP2))
+    medir('HTTP/2 (multiplexado)', base, titulos, 10)
+    medir('HTTP/2 (multiplexado)', base, titulos, HILOS_HTTP2)
+    # Más hilos que streams: el semáforo deja como máximo MAX_STREAMS_HTTP2 en vuelo
+    medir('HTTP/2 (multiplexado)', base, titulos, 2 * scraper.MAX_STREAMS_HTTP2)
+    scraper._cliente_http2.close()
+    apagar()
+
+
+if __name__ == '__main__':
+    main()
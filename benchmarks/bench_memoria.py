@@ -0,0 +1,212 @@
+"""
+Pico de RSS del pipeline anterior frente al modo compacto, con las páginas
+generadas localmente, sin red ni PostgreSQL; cada modo corre en su propio proceso.
+
+- anterior: como antes del registro de extractores, cada ficha se decodifica a
+  str y se parsea dos veces (BeautifulSoup y lxml); los resultados se acumulan
+  como dicts, la cola de enlaces no tiene límite y el CSV se escribe al final.
+- compacto: extracción en streaming, Pelicula, cola acotada y escritura por
+  lotes según el presupuesto de memoria.
+
+Se reporta el pico de RSS medido y su diferencia con el RSS tras importar los
+módulos, sin extrapolar: en el modo acotado el pico no crece en proporción a la
+cantidad de títulos, así que conviene correr el tamaño que interesa (10k por defecto).
+
+Uso: python benchmarks/bench_memoria.py [titulos] [presupuesto_mb]
+"""
+import csv
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from queue import Queue
+
+from bs4 import BeautifulSoup
+from lxml.html import fromstring
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_extractores import pagina_de_prueba  # noqa: E402
+from calidad import MonitorCobertura  # noqa: E402
+from extractores import XPATH_AÑO_ABSOLUTO, extraer_campos_stream, TAMAÑO_FRAGMENTO  # noqa: E402
+from memoria import dimensionar_memoria, rss_pico_mb  # noqa: E402
+from registros import EscritorCSV, pelicula_desde_campos  # noqa: E402
+
+HILOS = 10
+ACTORES = [f"Actor Número {i}" for i in range(5000)]
+PLANTILLA = pagina_de_prueba(relacionados=100).encode('utf-8')
+
+
+def pagina(i):
+    actores = [ACTORES[(i * 7 + k) % len(ACTORES)] for k in range(3)]
+    return (PLANTILLA
+            .replace(b'The Shawshank Redemption', f'Película {i}'.encode('utf-8'))
+            .replace(b'Tim Robbins', actores[0].encode('utf-8'))
+            .replace(b'Morgan Freeman', actores[1].encode('utf-8'))
+            .replace(b'Bob Gunton', actores[2].encode('utf-8')))
+
+
+def extraer(i):
+    contenido = pagina(i)
+    return extraer_campos_stream(contenido[n:n + TAMAÑO_FRAGMENTO]
+                                 for n in range(0, len(contenido), TAMAÑO_FRAGMENTO))
+
+
+def extraer_anterior(i):
+    """
+    Extracción previa al registro de extractores: str decodificado, un árbol de
+    BeautifulSoup y otro de lxml vivos a la vez por ficha.
+    """
+    texto = pagina(i).decode('utf-8')
+    soup = BeautifulSoup(texto, 'html.parser')
+    tree = fromstring(texto)
+    data = {}
+
+    title_tag = soup.find('h1')
+    if title_tag:
+        data['titulo'] = title_tag.get_text(strip=True)
+    año_element = tree.xpath(XPATH_AÑO_ABSOLUTO)
+    if año_element:
+        año_match = re.search(r'\d{4}', año_element[0].text_content())
+        if año_match:
+            data['año'] = int(año_match.group())
+    rating_tag = soup.select_one('[data-testid="hero-rating-bar__aggregate-rating__score"] span')
+    if rating_tag:
+        data['calificacion'] = float(rating_tag.text.strip())
+    duracion_tag = soup.select_one('li[data-testid="title-techspec_runtime"]')
+    if duracion_tag:
+        duracion_text = duracion_tag.get_text(strip=True)
+        horas = re.search(r'(\d+)h', duracion_text)
+        minutos = re.search(r'(\d+)m', duracion_text)
+        data['duracion_min'] = (int(horas.group(1)) * 60 if horas else 0) + (int(minutos.group(1)) if minutos else 0)
+    for span in soup.select('section span'):
+        texto_span = span.get_text(strip=True)
+        if texto_span.isdigit() and 0 <= int(texto_span) <= 100:
+            padre = span.find_parent('li')
+            if padre and 'Metascore' in padre.get_text():
+                data['metascore'] = int(texto_span)
+                break
+    actores = []
+    for block in soup.select('li[data-testid="title-pc-principal-credit"]'):
+        if 'Stars' in block.text:
+            for tag in block.select('a[href^="/name/"]'):
+                nombre = tag.text.strip()
+                if nombre and nombre.lower() != "see more":
+                    actores.append(nombre)
+                if len(actores) == 3:
+                    break
+            break
+    data['actores'] = actores
+    return data
+
+
+def escribir_enlaces(path, titulos):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Posición', 'Enlace'])
+        for i in range(titulos):
+            writer.writerow([i + 1, f"https://www.imdb.com/title/tt{i:07d}/"])
+
+
+def modo_anterior(enlaces, salida, presupuesto_mb):
+    resultados = []
+    resultados_lock = threading.Lock()
+    tareas = Queue()
+    with open(enlaces, 'r', encoding='utf-8') as f:
+        for fila in csv.DictReader(f):
+            tareas.put(fila['Enlace'])
+
+    def trabajador():
+        while not tareas.empty():
+            url = tareas.get()
+            info = extraer_anterior(int(url.rstrip('/').rsplit('tt', 1)[1]))
+            info['url'] = url
+            with resultados_lock:
+                resultados.append(info)
+
+    hilos = [threading.Thread(target=trabajador) for _ in range(HILOS)]
+    for t in hilos:
+        t.start()
+    for t in hilos:
+        t.join()
+
+    with open(salida, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['titulo', 'año', 'calificacion', 'duracion_min', 'metascore',
+                                               'actores', 'url'])
+        writer.writeheader()
+        for fila in resultados:
+            fila['actores'] = ', '.join(fila.get('actores', []))
+            writer.writerow(fila)
+    return len(resultados)
+
+
+def modo_compacto(enlaces, salida, presupuesto_mb):
+    n_hilos, tamaño_cola, tamaño_lote = dimensionar_memoria(presupuesto_mb, HILOS)
+    tareas = Queue(maxsize=tamaño_cola)
+    escritor = EscritorCSV(salida, tamaño_lote)
+    monitor = MonitorCobertura()
+
+    def productor():
+        try:
+            with open(enlaces, 'r', encoding='utf-8') as f:
+                for fila in csv.DictReader(f):
+                    tareas.put(fila['Enlace'])
+        finally:
+            for _ in range(n_hilos):
+                tareas.put(None)
+
+    def trabajador():
+        while True:
+            url = tareas.get()
+            if url is None:
+                break
+            pelicula, valido = monitor.registrar(
+                pelicula_desde_campos(extraer(int(url.rstrip('/').rsplit('tt', 1)[1])), url))
+            if valido:
+                escritor.agregar(pelicula)
+
+    hilos = [threading.Thread(target=productor)] + [threading.Thread(target=trabajador) for _ in range(n_hilos)]
+    for t in hilos:
+        t.start()
+    for t in hilos:
+        t.join()
+    escritor.cerrar()
+    return escritor.total
+
+
+def ejecutar(modo, titulos, presupuesto_mb):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        enlaces = os.path.join(tmpdir, 'enlaces.csv')
+        escribir_enlaces(enlaces, titulos)
+        inicio = time.perf_counter()
+        total = {'anterior': modo_anterior, 'compacto': modo_compacto}[modo](
+            enlaces, os.path.join(tmpdir, 'detalle.csv'), presupuesto_mb)
+        transcurrido = time.perf_counter() - inicio
+    print(f"{modo},{total},{transcurrido:.1f},{rss_pico_mb():.1f}")
+
+
+def main():
+    titulos = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    presupuesto_mb = int(sys.argv[2]) if len(sys.argv) > 2 else 128
+    base = float(subprocess.run(
+        [sys.executable, '-c', f'import sys; sys.path.insert(0, {os.path.dirname(__file__)!r}); '
+                               'import bench_memoria, memoria; print(memoria.rss_pico_mb())'],
+        capture_output=True, text=True, check=True).stdout)
+
+    print(f"{titulos} títulos, presupuesto {presupuesto_mb} MB, RSS tras importar módulos {base:.0f} MB")
+    print(f"{'modo':<10}{'títulos':>9}{'tiempo':>10}{'pico RSS':>12}{'sobre base':>12}")
+    for modo in ('anterior', 'compacto'):
+        salida = subprocess.run([sys.executable, __file__, '--modo', modo, str(titulos), str(presupuesto_mb)],
+                                capture_output=True, text=True, check=True).stdout
+        _, total, transcurrido, pico = salida.strip().splitlines()[-1].split(',')
+        print(f"{modo:<10}{total:>9}{transcurrido:>8} s{float(pico):>9.0f} MB{float(pico) - base:>9.0f} MB")
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--modo':
+        ejecutar(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
+    else:
+        main()
@@ -0,0 +1,87 @@
+"""
+Compara la descarga completa (`response.text` + lxml) con la lectura en streaming
+con corte temprano, contra un servidor local que simula un proxy lento.
+
+Uso: python benchmarks/bench_stream.py [kb_por_segundo]
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from lxml.html import fromstring
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_extractores import pagina_de_prueba  # noqa: E402
+from extractores import extraer_campos, extraer_campos_stream, TAMAÑO_FRAGMENTO  # noqa: E402
+
+PAGINA = pagina_de_prueba().encode('utf-8')
+BLOQUE = 16 * 1024
+
+
+class ServidorLento(BaseHTTPRequestHandler):
+    kb_por_segundo = 2048
+    enviados = 0
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(PAGINA)))
+        self.end_headers()
+        pausa = BLOQUE / 1024 / self.kb_por_segundo
+        try:
+            for inicio in range(0, len(PAGINA), BLOQUE):
+                self.wfile.write(PAGINA[inicio:inicio + BLOQUE])
+                ServidorLento.enviados += BLOQUE
+                time.sleep(pausa)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+def completo(url):
+    response = requests.get(url)
+    return extraer_campos(fromstring(response.text))
+
+
+def streaming(url):
+    with requests.get(url, stream=True) as response:
+        return extraer_campos_stream(response.iter_content(TAMAÑO_FRAGMENTO))
+
+
+def medir(nombre, funcion, url):
+    ServidorLento.enviados = 0
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    data = funcion(url)
+    transcurrido = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    time.sleep(0.2)  # deja que el servidor note el cierre de la conexión
+    print(f"{nombre:<10}{transcurrido * 1e3:>10.1f} ms{min(ServidorLento.enviados, len(PAGINA)) / 1024:>10.0f} KB"
+          f"{pico / 1024:>12.0f} KB")
+    return data
+
+
+def main():
+    if len(sys.argv) > 1:
+        ServidorLento.kb_por_segundo = int(sys.argv[1])
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), ServidorLento)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{servidor.server_port}/title/tt0111161/"
+
+    print(f"Página de {len(PAGINA) / 1024:.0f} KB a {ServidorLento.kb_por_segundo} KB/s")
+    print(f"{'modo':<10}{'tiempo':>13}{'enviado':>13}{'pico memoria':>15}")
+    assert medir('completo', completo, url) == medir('streaming', streaming, url)
+    servidor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
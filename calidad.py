@@ -0,0 +1,128 @@
+import json
+import logging
+import os
+import threading
+from collections import deque
+from datetime import date
+
+# Rangos válidos por campo; un valor fuera de rango se trata como no extraído
+VALIDADORES = {
+    'titulo': lambda v: bool(v),
+    'año': lambda v: 1870 <= v <= date.today().year + 5,
+    'calificacion': lambda v: 1.0 <= v <= 10.0,
+    'duracion_min': lambda v: 0 < v < 1500,
+    'metascore': lambda v: 0 <= v <= 100,
+    'actores': lambda v: all(v),
+}
+# Campos sin los cuales un registro no se guarda
+CAMPOS_REQUERIDOS = ('titulo',)
+# Campos cuya cobertura se vigila para pausar la descarga. Un título sin año o sin
+# calificación (p. ej. aún sin votos) se guarda igual; sólo preocupa si faltan en
+# muchos registros seguidos. El metascore es opcional en IMDb.
+CAMPOS_CRITICOS = ('titulo', 'año', 'calificacion')
+
+
+class MonitorCobertura:
+    """
+    Valida cada registro extraído y lleva la tasa de llenado por campo sobre una
+    ventana deslizante de los últimos `ventana` registros.
+
+    Cada registro se guarda como una máscara de bits en un deque de tamaño fijo y
+    los contadores por campo se actualizan al entrar y salir de la ventana, así
+    que el costo por registro es O(1). Cuando la ventana está llena y algún campo
+    crítico baja de `umbral`, se activa `pausa` para que los trabajadores dejen de
+    pedir páginas. Las descargas fallidas se cuentan aparte y no entran en la
+    ventana: un proxy inestable no es una página con otro marcado.
+    """
+
+    def __init__(self, ventana=50, umbral=0.5, criticos=CAMPOS_CRITICOS, requeridos=CAMPOS_REQUERIDOS):
+        self.ventana = ventana
+        self.umbral = umbral
+        self.campos = tuple(VALIDADORES)
+        self.criticos = tuple(self.campos.index(campo) for campo in criticos)
+        self.requeridos = tuple(self.campos.index(campo) for campo in requeridos)
+        self.pausa = threading.Event()
+        self._mascaras = deque(maxlen=ventana)
+        self._en_ventana = [0] * len(self.campos)
+        self._totales = [0] * len(self.campos)
+        self._registros = 0
+        self._rechazados = 0
+        self._fallos = 0
+        self._lock = threading.Lock()
+
+    def registrar(self, pelicula):
+        """
+        Valida una Pelicula y actualiza los contadores. Devuelve (pelicula, valido):
+        los valores fuera de rango se reemplazan por None y `valido` indica si
+        tiene todos los campos requeridos.
+        """
+        mascara = 0
+        invalidos = {}
+        for i, campo in enumerate(self.campos):
+            valor = getattr(pelicula, campo)
+            if valor is None or valor == ():
+                continue
+            if VALIDADORES[campo](valor):
+                mascara |= 1 << i
+            else:
+                logging.warning(f"Fail Valor inválido en '{campo}' ({valor!r}) para {pelicula.url}")
+                invalidos[campo] = None
+        if invalidos:
+            pelicula = pelicula._replace(**invalidos)
+        valido = all(mascara >> i & 1 for i in self.requeridos)
+
+        with self._lock:
+            if len(self._mascaras) == self.ventana:
+                saliente = self._mascaras[0]
+                for i in range(len(self.campos)):
+                    self._en_ventana[i] -= saliente >> i & 1
+            self._mascaras.append(mascara)
+            for i in range(len(self.campos)):
+                bit = mascara >> i & 1
+                self._en_ventana[i] += bit
+                self._totales[i] += bit
+            self._registros += 1
+            self._rechazados += not valido
+
+            if len(self._mascaras) == self.ventana and not self.pausa.is_set():
+                caidos = [self.campos[i] for i in self.criticos if self._en_ventana[i] / self.ventana < self.umbral]
+                if caidos:
+                    logging.error(f"Fail Cobertura por debajo de {self.umbral:.0%} en {', '.join(caidos)} "
+                                  f"en los últimos {self.ventana} registros; se pausa la descarga")
+                    self.pausa.set()
+        return pelicula, valido
+
+    def registrar_fallo(self):
+        """
+        Cuenta una página que no se pudo descargar, sin tocar la ventana de cobertura.
+        """
+        with self._lock:
+            self._fallos += 1
+
+    def tasas_ventana(self):
+        with self._lock:
+            n = len(self._mascaras) or 1
+            return {campo: self._en_ventana[i] / n for i, campo in enumerate(self.campos)}
+
+    def resumen(self):
+        with self._lock:
+            n = self._registros or 1
+            return {
+                'registros': self._registros,
+                'rechazados': self._rechazados,
+                'fallos_descarga': self._fallos,
+                'pausado': self.pausa.is_set(),
+                'cobertura': {campo: round(self._totales[i] / n, 4) for i, campo in enumerate(self.campos)},
+            }
+
+    def escribir_resumen(self, path='data/cobertura.json'):
+        """
+        Registra la cobertura por campo de toda la ejecución y la guarda en JSON.
+        """
+        resumen = self.resumen()
+        for campo, tasa in resumen['cobertura'].items():
+            logging.info(f"Done Cobertura {campo}: {tasa:.1%}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(resumen, f, ensure_ascii=False, indent=2)
+        return resumen
@@ -1 +1,13 @@
-use_proxies = False
\ No newline at end of file
+use_proxies = False
+use_streaming = True
+# Requiere pip install 'httpx[http2]'; sólo se usa sin proxies
+use_http2 = False
+# Control de calidad: se pausa la descarga si en los últimos `ventana_cobertura`
+# registros algún campo crítico queda por debajo de `umbral_cobertura`
+ventana_cobertura = 50
+umbral_cobertura = 0.5
+# Charts y listas de los que se toman los enlaces: nombres de fuentes.FUENTES o
+# 'lista:<id>' / 'genero:<género>'. Los títulos repetidos se descargan una vez.
+fuentes_imdb = ['top250']
+# Techo de RSS en MB para corridas grandes; None = sin límite
+presupuesto_memoria_mb = None
@@ -0,0 +1,236 @@
+import re
+import threading
+from collections import namedtuple
+
+from lxml import etree
+from lxml.html import HTMLParser, HtmlElementClassLookup, fromstring
+
+from scraper import CODIFICACION
+
+# Registro de extractores por campo.
+#
+# Cada campo se declara una sola vez como una cadena de selectores XPath
+# (de más específico a más genérico) y una función de conversión que recibe el
+# elemento encontrado y devuelve el valor limpio, o None si no sirve. Todo se
+# compila al importar el módulo, así que extraer una película no vuelve a
+# compilar expresiones XPath ni regex.
+
+Campo = namedtuple('Campo', ['selectores', 'convertir', 'opcional'], defaults=(False,))
+
+RE_AÑO = re.compile(r'\d{4}')
+RE_HORAS = re.compile(r'(\d+)h')
+RE_MINUTOS = re.compile(r'(\d+)m')
+
+# Ruta absoluta histórica del año en la cabecera de la ficha
+XPATH_AÑO_ABSOLUTO = ('id("__next")/main/div/section[1]/section/div[3]/section/section'
+                      '/div[2]/div[1]/ul/li[1]/a')
+
+_NOMBRES_ACTORES = etree.XPath('.//a[starts-with(@href, "/name/")]')
+
+# Un elemento está completo en un árbol parcial cuando el parser ya creó algún
+# nodo posterior a él (y por tanto cerró sus etiquetas).
+_CERRADO = etree.XPath('boolean(following::node())')
+
+# Sección de especificaciones técnicas: va después de la cabecera, los créditos y
+# las reseñas, así que cuando se cierra ya se vio toda la zona de campos.
+_FIN_CAMPOS = etree.XPath('//li[@data-testid="title-techspec_runtime"]/ancestor::section[1]')
+
+TAMAÑO_FRAGMENTO = 32 * 1024
+
+# Un parser por hilo: lxml serializa el uso concurrente de una misma instancia
+_local = threading.local()
+
+
+def _xpaths(*expresiones):
+    return tuple(etree.XPath(expresion) for expresion in expresiones)
+
+
+def _texto(elemento):
+    texto = elemento.text_content().strip()
+    return texto or None
+
+
+def _año(elemento):
+    año_match = RE_AÑO.search(elemento.text_content())
+    if año_match:
+        return int(año_match.group())
+    return None
+
+
+def _calificacion(elemento):
+    try:
+        return float(elemento.text_content().strip())
+    except ValueError:
+        return None
+
+
+def _duracion(elemento):
+    duracion_text = elemento.text_content()
+    horas = RE_HORAS.search(duracion_text)
+    minutos = RE_MINUTOS.search(duracion_text)
+    total_min = 0
+    if horas:
+        total_min += int(horas.group(1)) * 60
+    if minutos:
+        total_min += int(minutos.group(1))
+    return total_min or None
+
+
+def _metascore(elemento):
+    texto = elemento.text_content().strip()
+    if texto.isdigit():
+        valor = int(texto)
+        if 0 <= valor <= 100:
+            return valor
+    return None
+
+
+def _actores(elemento):
+    actores = []
+    for tag in _NOMBRES_ACTORES(elemento):
+        nombre = tag.text_content().strip()
+        if nombre and nombre.lower() != "see more":
+            actores.append(nombre)
+        if len(actores) == 3:
+            break
+    return actores or None
+
+
+CAMPOS = {
+    'titulo': Campo(_xpaths('//h1'), _texto),
+    'año': Campo(
+        _xpaths(XPATH_AÑO_ABSOLUTO,
+                '//h1/following::a[contains(@href, "/releaseinfo")][1]'),
+        _año),
+    'calificacion': Campo(
+        _xpaths('//div[@data-testid="hero-rating-bar__aggregate-rating__score"]//span[1]'),
+        _calificacion),
+    'duracion_min': Campo(_xpaths('//li[@data-testid="title-techspec_runtime"]'), _duracion),
+    # Primero la caja de Metacritic; si no existe, se ancla en la etiqueta
+    # "Metascore" y sólo se revisan los span hoja de su <li>.
+    'metascore': Campo(
+        _xpaths('//span[contains(@class, "metacritic-score-box")]',
+                '//section//span[normalize-space(text())="Metascore"]/ancestor::li[1]//span[not(*)]'),
+        _metascore,
+        opcional=True),
+    'actores': Campo(
+        _xpaths('(//li[@data-testid="title-pc-principal-credit"][contains(., "Stars")])[1]'),
+        _actores),
+}
+
+
+def parsear_html(contenido):
+    """
+    Parsea los bytes crudos de una página con la codificación declarada, sin
+    pasar por un str intermedio.
+    """
+    parser = getattr(_local, 'parser', None)
+    if parser is None:
+        parser = _local.parser = HTMLParser(encoding=CODIFICACION)
+    return fromstring(contenido, parser=parser)
+
+
+def resolver_campo(campo, tree):
+    """
+    Recorre la cadena de selectores de un campo y devuelve (valor, elemento) del
+    primer elemento que produce un valor válido, o (None, None).
+    """
+    for selector in campo.selectores:
+        for elemento in selector(tree):
+            valor = campo.convertir(elemento)
+            if valor is not None:
+                return valor, elemento
+    return None, None
+
+
+def extraer_campos(tree, campos=CAMPOS):
+    """
+    Extrae todos los campos registrados de un árbol lxml de una ficha de IMDb.
+    """
+    data = {}
+    for nombre, campo in campos.items():
+        valor, _ = resolver_campo(campo, tree)
+        if valor is not None:
+            data[nombre] = valor
+    data.setdefault('actores', [])
+    return data
+
+
+def _resolver_primario(campo, raiz):
+    """
+    Resuelve un campo en un árbol parcial usando sólo su primer selector.
+    Devuelve None mientras el elemento candidato no esté cerrado.
+    """
+    for elemento in campo.selectores[0](raiz):
+        if not _CERRADO(elemento):
+            return None
+        valor = campo.convertir(elemento)
+        if valor is not None:
+            return valor
+    return None
+
+
+def _zona_de_campos_cerrada(raiz):
+    return any(_CERRADO(seccion) for seccion in _FIN_CAMPOS(raiz))
+
+
+def extraer_campos_stream(fragmentos, campos=CAMPOS):
+    """
+    Extrae los campos registrados a medida que llegan fragmentos de bytes del HTML.
+
+    Deja de consumir `fragmentos` en cuanto todos los campos se resolvieron con su
+    selector principal; el llamador puede entonces cerrar la conexión sin
+    descargar el resto de la página. También se detiene cuando se cierra la
+    sección de especificaciones técnicas: en ese punto los campos pendientes se
+    resuelven con toda su cadena de selectores sobre el árbol parcial y los
+    opcionales que sigan sin valor (p. ej. el metascore) se dan por ausentes.
+    Si falta algún campo obligatorio, se sigue leyendo y los respaldos se
+    evalúan con el documento completo, como en `extraer_campos`.
+    """
+    parser = etree.HTMLPullParser(events=('start',), tag='html', encoding=CODIFICACION)
+    parser.set_element_class_lookup(HtmlElementClassLookup())
+    raiz = None
+    pendientes = dict(campos)
+    data = {}
+    buscar = True
+
+    try:
+        for fragmento in fragmentos:
+            parser.feed(fragmento)
+            for _, elemento in parser.read_events():
+                raiz = elemento
+            if raiz is None or not buscar:
+                continue
+
+            for nombre, campo in list(pendientes.items()):
+                valor = _resolver_primario(campo, raiz)
+                if valor is not None:
+                    data[nombre] = valor
+                    del pendientes[nombre]
+            if not pendientes:
+                break
+
+            if _zona_de_campos_cerrada(raiz):
+                for nombre, campo in list(pendientes.items()):
+                    valor, _ = resolver_campo(campo, raiz)
+                    if valor is not None:
+                        data[nombre] = valor
+                    if valor is not None or campo.opcional:
+                        del pendientes[nombre]
+                if not pendientes:
+                    break
+                # Falta un campo obligatorio: se lee hasta el final sin volver a evaluar
+                buscar = False
+        else:
+            raiz = parser.close()
+            for nombre, campo in pendientes.items():
+                valor, _ = resolver_campo(campo, raiz)
+                if valor is not None:
+                    data[nombre] = valor
+    finally:
+        # Suelta el parser y el árbol (parcial o completo) aunque una excepción
+        # conserve este frame en su traceback
+        parser = raiz = elemento = _ = None
+
+    data.setdefault('actores', [])
+    return data
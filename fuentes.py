@@ -0,0 +1,168 @@
+import csv
+import logging
+import os
+import threading
+from array import array
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from scraper import TOP_URL, URL_TITULO, get_page, extraer_ids_titulos
+
+# Una fuente es un chart, lista o búsqueda de IMDb. `url_pagina(n)` devuelve la
+# URL de la página n (desde 1); las fuentes de una sola página tienen
+# max_paginas=1.
+Fuente = namedtuple('Fuente', ['nombre', 'url_pagina', 'max_paginas'])
+
+
+def fuente_chart(nombre, url):
+    return Fuente(nombre, lambda n: url, 1)
+
+
+def fuente_lista(id_lista, max_paginas=10):
+    return Fuente(f'lista:{id_lista}',
+                  lambda n: f"https://www.imdb.com/list/{id_lista}/?page={n}", max_paginas)
+
+
+def fuente_genero(genero, max_paginas=5):
+    return Fuente(f'genero:{genero}',
+                  lambda n: (f"https://www.imdb.com/search/title/?title_type=feature&genres={genero}"
+                             f"&sort=num_votes,desc&start={(n - 1) * 50 + 1}"),
+                  max_paginas)
+
+
+FUENTES = {
+    'top250': fuente_chart('top250', TOP_URL),
+    'populares': fuente_chart('populares', "https://www.imdb.com/chart/moviemeter/"),
+    'top_ingles': fuente_chart('top_ingles', "https://www.imdb.com/chart/top-english-movies/"),
+}
+
+# Constructores para fuentes con parámetro, p. ej. 'lista:ls055592025' o 'genero:horror'
+TIPOS_FUENTE = {
+    'lista': fuente_lista,
+    'genero': fuente_genero,
+}
+
+
+def fuente_desde_texto(texto):
+    """
+    Resuelve una fuente a partir de su nombre en FUENTES o de 'tipo:parámetro'.
+    """
+    if texto in FUENTES:
+        return FUENTES[texto]
+    tipo, _, parametro = texto.partition(':')
+    if tipo not in TIPOS_FUENTE or not parametro:
+        raise ValueError(f"Fuente desconocida: {texto}")
+    return TIPOS_FUENTE[tipo](parametro)
+
+
+class IndiceTitulos:
+    """
+    Índice compacto de IDs tt: un bit por ID numérico en un bytearray que crece
+    según el mayor ID visto (~5 MB para todo el rango actual de IMDb), más el
+    orden de llegada de los IDs únicos en un array de enteros de 32 bits.
+    """
+
+    def __init__(self):
+        self._bits = bytearray()
+        self.orden = array('I')
+        self._lock = threading.Lock()
+
+    def agregar(self, tt):
+        """
+        Agrega un ID y devuelve True si no estaba en el índice.
+        """
+        byte, bit = tt >> 3, 1 << (tt & 7)
+        with self._lock:
+            if byte >= len(self._bits):
+                self._bits.extend(bytes(byte + 1 - len(self._bits)))
+            elif self._bits[byte] & bit:
+                return False
+            self._bits[byte] |= bit
+            self.orden.append(tt)
+            return True
+
+    def __contains__(self, tt):
+        byte = tt >> 3
+        return byte < len(self._bits) and bool(self._bits[byte] & 1 << (tt & 7))
+
+    def __len__(self):
+        return len(self.orden)
+
+
+def rastrear_fuente(fuente):
+    """
+    Descarga las páginas de una fuente y devuelve sus IDs en orden de ranking.
+    La paginación se corta cuando una página no aporta IDs nuevos.
+    """
+    # Una fuente tiene a lo sumo unos miles de IDs: un set basta y evita reservar
+    # un bitmap del tamaño del mayor ID por cada fuente rastreada en paralelo
+    vistos = set()
+    orden = array('I')
+    for n in range(1, fuente.max_paginas + 1):
+        url = fuente.url_pagina(n)
+        content = get_page(url, binario=True)
+        if content is None:
+            logging.warning(f"Fail No se pudo descargar {url} ({fuente.nombre})")
+            break
+        nuevos = 0
+        for tt in extraer_ids_titulos(content):
+            if tt not in vistos:
+                vistos.add(tt)
+                orden.append(tt)
+                nuevos += 1
+        if not nuevos:
+            break
+    logging.info(f"Great {fuente.nombre}: {len(orden)} títulos")
+    return orden
+
+
+def rastrear_fuentes(fuentes, max_hilos=8):
+    """
+    Rastrea varias fuentes en paralelo y las fusiona en un solo índice, de modo
+    que cada título aparece una vez aunque esté en varias fuentes.
+
+    Devuelve (indice, rangos): `indice.orden` tiene los IDs únicos en el orden de
+    `fuentes` y luego por ranking; `rangos` guarda, por fuente, sus IDs en orden
+    de ranking (la posición en el array es el ranking en esa fuente). Las fuentes
+    repetidas (mismo nombre) se rastrean una sola vez.
+    """
+    unicas = {}
+    for fuente in fuentes:
+        if fuente.nombre in unicas:
+            logging.warning(f"Fail Fuente repetida en la configuración, se ignora: {fuente.nombre}")
+        else:
+            unicas[fuente.nombre] = fuente
+    fuentes = list(unicas.values())
+
+    with ThreadPoolExecutor(max_workers=max_hilos) as ejecutor:
+        resultados = list(ejecutor.map(rastrear_fuente, fuentes))
+
+    indice = IndiceTitulos()
+    rangos = {}
+    for fuente, ids in zip(fuentes, resultados):
+        rangos[fuente.nombre] = ids
+        for tt in ids:
+            indice.agregar(tt)
+    logging.info(f"Done {len(indice)} títulos únicos de {sum(map(len, resultados))} en {len(fuentes)} fuentes")
+    return indice, rangos
+
+
+def guardar_enlaces(indice, rangos, output_csv_path='data/enlaces_peliculas.csv'):
+    """
+    Guarda los títulos únicos con su posición global y su ranking en cada fuente
+    (p. ej. 'top250:1;populares:35').
+    """
+    fuentes_por_titulo = {}
+    for nombre, ids in rangos.items():
+        for posicion, tt in enumerate(ids, start=1):
+            fuentes_por_titulo.setdefault(tt, []).append(f"{nombre}:{posicion}")
+
+    os.makedirs(os.path.dirname(output_csv_path), exist_ok=True)
+    with open(output_csv_path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(['Posición', 'Enlace', 'Fuentes'])
+        for i, tt in enumerate(indice.orden, start=1):
+            writer.writerow([i, URL_TITULO.format(tt), ';'.join(fuentes_por_titulo[tt])])
+
+    logging.info(f"Great Se guardaron {len(indice)} enlaces en '{output_csv_path}'")
+    return len(indice)
@@ -0,0 +1,48 @@
+import logging
+import sys
+
+try:
+    import resource
+except ImportError:  # Windows: sin getrusage no se reporta el pico de RSS
+    resource = None
+
+# Estimaciones usadas para repartir el presupuesto de memoria (medidas con
+# benchmarks/bench_memoria.py sobre fichas de ~250 KB)
+MEMORIA_BASE_MB = 60         # intérprete, lxml, requests, psycopg2
+MEMORIA_POR_HILO_MB = 8      # respuesta + árbol lxml de una ficha en vuelo
+BYTES_POR_ENLACE = 200       # URL pendiente en la cola de tareas
+BYTES_POR_REGISTRO = 400     # Pelicula esperando en el lote del CSV
+TAMAÑO_LOTE_DEFECTO = 500
+
+
+def dimensionar_memoria(presupuesto_mb, hilos):
+    """
+    Reparte un techo de RSS en MB entre hilos, cola de tareas y lote de escritura.
+    Devuelve (hilos, tamaño_cola, tamaño_lote); tamaño_cola 0 es cola sin límite.
+    Sin presupuesto (None) la cola no tiene límite y el lote usa el valor por defecto.
+    """
+    if presupuesto_mb is None:
+        return hilos, 0, TAMAÑO_LOTE_DEFECTO
+
+    disponible_mb = presupuesto_mb - MEMORIA_BASE_MB
+    hilos_posibles = max(1, int(disponible_mb * 0.8 // MEMORIA_POR_HILO_MB))
+    if hilos_posibles < hilos:
+        logging.warning(f"Presupuesto de {presupuesto_mb} MB: se reducen los hilos de {hilos} a {hilos_posibles}")
+        hilos = hilos_posibles
+
+    # Lo que no usan los hilos se reparte entre la cola y el lote de escritura
+    resto = max(0, disponible_mb - hilos * MEMORIA_POR_HILO_MB) * 1024 * 1024
+    tamaño_cola = int(min(max(hilos * 4, resto * 0.1 // BYTES_POR_ENLACE), 10_000))
+    tamaño_lote = int(min(max(50, resto * 0.1 // BYTES_POR_REGISTRO), 5_000))
+    return hilos, tamaño_cola, tamaño_lote
+
+
+def rss_pico_mb():
+    """
+    Pico de memoria residente del proceso en MB, o None si no se puede medir.
+    """
+    if resource is None:
+        return None
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024 if sys.platform == 'darwin' else 1024)
@@ -5,20 +5,20 @@ import threading
 from functools import wraps
 from queue import Queue
 
-from lxml import html
-from lxml.html import fromstring
-import requests
-from bs4 import BeautifulSoup
-import re
-from scraper import get_headers, obtener_ip_publica, get_page, extraer_enlaces_imdb
+from calidad import MonitorCobertura
+from extractores import extraer_campos, extraer_campos_stream, parsear_html, TAMAÑO_FRAGMENTO
+from fuentes import fuente_desde_texto, guardar_enlaces, rastrear_fuentes
+from memoria import dimensionar_memoria, rss_pico_mb
+from registros import EscritorCSV, pelicula_desde_campos
+from scraper import get_headers, obtener_ip_publica, abrir_pagina, cliente_http2
 import psycopg2
 from psycopg2 import sql
 from dotenv import load_dotenv
 import logging
-from config import use_proxies
+from config import (use_proxies, use_streaming, ventana_cobertura, umbral_cobertura, fuentes_imdb,
+                    presupuesto_memoria_mb)
 load_dotenv()
 
-TOP_URL = "https://www.imdb.com/chart/top/"
 # Asegura que la carpeta de logs exista
 os.makedirs("data", exist_ok=True)
 
@@ -35,22 +35,9 @@ logging.basicConfig(
 with open("data/proxies/valid_proxies.txt", "r") as f:
     proxies = f.read().split('\n')
 
-
-def extraer_metascore_flexible(soup):
-    """
-    Extrae el metascore desde IMDb usando heurísticas cuando no tiene data-testid.
-    """
-    posibles_spans = soup.select('section span')
-    for span in posibles_spans:
-        texto = span.get_text(strip=True)
-        if texto.isdigit():
-            valor = int(texto)
-            if 0 <= valor <= 100:
-                # Heurística: si el padre o abuelo tiene otras pistas visuales
-                padre = span.find_parent('li')
-                if padre and 'Metascore' in padre.get_text():
-                    return valor
-    return None
+monitor_calidad = MonitorCobertura(ventana_cobertura, umbral_cobertura)
+HILOS = 10
+HILOS_HTTP2 = 32
 
 
 def probar_conexion():
@@ -71,14 +58,46 @@ def probar_conexion():
         return False
 
 
+def hilos_de_descarga():
+    """
+    Con HTTP/2 las peticiones comparten una conexión, así que se lanzan
+    HILOS_HTTP2 trabajadores; el semáforo de streams de scraper sigue acotando
+    las peticiones en vuelo. Con HTTP/1.1 se usan HILOS.
+    """
+    if not use_proxies and cliente_http2() is not None:
+        return HILOS_HTTP2
+    return HILOS
+
+
+def validar_calidad(func):
+    """
+    Valida el registro extraído y lo descarta (devuelve None) si le faltan campos
+    requeridos, antes de que llegue a PostgreSQL o al CSV. Las descargas fallidas
+    se cuentan aparte, sin afectar la cobertura.
+    """
+    @wraps(func)
+    def wrapper(url, *args, **kwargs):
+        pelicula = func(url, *args, **kwargs)
+        if pelicula is None:
+            monitor_calidad.registrar_fallo()
+            return None
+        pelicula, valido = monitor_calidad.registrar(pelicula)
+        if not valido:
+            logging.warning(f"Fail Registro incompleto descartado: {url}")
+            return None
+        return pelicula
+
+    return wrapper
+
+
 def insertar_en_bd(func):
     @wraps(func)
     def wrapper(url, *args, **kwargs):
         # Ejecutar la función original
         data = func(url, *args, **kwargs)
+        if data is None:
+            return None
 
-        # Añadir URL a los datos para la inserción
-        data['url'] = url
         ip = obtener_ip_publica()
         try:
             logging.debug(f'{os.environ.get("DB_HOST")}, {os.environ.get("DB_PORT")}, {os.environ.get("POSTGRES_DB")}, {os.environ.get("POSTGRES_USER")}, {os.environ.get("POSTGRES_PASSWORD")}')
@@ -99,11 +118,11 @@ def insertar_en_bd(func):
                     RETURNING id;
                     """),
                 (
-                    data.get('titulo'),
-                    data.get('año'),
-                    data.get('calificacion'),
-                    data.get('duracion_min'),
-                    data.get('metascore'),
+                    data.titulo,
+                    data.año,
+                    data.calificacion,
+                    data.duracion_min,
+                    data.metascore,
                     url
                 )
             )
@@ -116,7 +135,7 @@ def insertar_en_bd(func):
                 logging.info(f"Up PostgreSQL: Película insertada ID {pelicula_id}")
 
                 # 2. Insertar actores relacionados
-                actores = data.get('actores', [])
+                actores = data.actores
                 for actor in actores:
                     cur.execute(
                         sql.SQL("""
@@ -128,7 +147,7 @@ def insertar_en_bd(func):
                 logging.info(f"Up Insertados {len(actores)} actores para película ID {pelicula_id}")
 
             conn.commit()
-            logging.info(f"Up PostgreSQL: {data.get('titulo', 'N/A')}")
+            logging.info(f"Up PostgreSQL: {data.titulo or 'N/A'}")
             conn.close()
         except psycopg2.Error as e:
             logging.error(f"Fail Error PostgreSQL: {e}")
@@ -175,6 +194,7 @@ def crear_tabla_si_no_existe():
 
 
 @insertar_en_bd
+@validar_calidad
 def extraer_info_pelicula(url):
     headers = get_headers()
     intentos_max = 5
@@ -183,94 +203,33 @@ def extraer_info_pelicula(url):
         proxy_idx = random.randint(0, len(proxies) - 1)
         proxy_actual = proxies[proxy_idx]
         try:
+            peticion = {}
             if use_proxies:
-                response = requests.get(
-                    url,
-                    headers=headers,
-                    proxies={"http": proxy_actual,
-                             "https": proxy_actual},
-                    timeout=10
-                )
-            else:
-                response = requests.get(
-                    url,
-                    headers=headers
-                )
-
-            if response.status_code != 200:
-                raise Exception(f"HTTP {response.status_code}")
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-            tree = fromstring(response.text)
-            data = {}
-
-            # Título
-            title_tag = soup.find('h1')
-            if title_tag:
-                data['titulo'] = title_tag.get_text(strip=True)
-            ip = obtener_ip_publica()
-            # año
-            try:
-                # El XPath que proporcionaste
-                año_element = tree.xpath(
-                    '//*[@id="__next"]/main/div/section[1]/section/div[3]/section/section/div[2]/div[1]/ul/li[1]/a')
-
-                if año_element:
-                    año_text = año_element[0].text.strip()
-                    año_match = re.search(r'\d{4}', año_text)
-                    if año_match:
-                        data['año'] = int(año_match.group())
-            except Exception as e:
-                logging.warning(f"Error extrayendo año con XPath: {e}")
-            # Calificación IMDb
-            rating_tag = soup.select_one('[data-testid="hero-rating-bar__aggregate-rating__score"] span')
-            if rating_tag:
-                try:
-                    data['calificacion'] = float(rating_tag.text.strip())
-                except ValueError:
-                    pass
-
-            # Duración
-            duracion_tag = soup.select_one('li[data-testid="title-techspec_runtime"]')
-            if duracion_tag:
-                duracion_text = duracion_tag.get_text(strip=True)
-                horas = re.search(r'(\d+)h', duracion_text)
-                minutos = re.search(r'(\d+)m', duracion_text)
-                total_min = 0
-                if horas:
-                    total_min += int(horas.group(1)) * 60
-                if minutos:
-                    total_min += int(minutos.group(1))
-                if total_min > 0:
-                    data['duracion_min'] = total_min
-
-            # Metascore (nuevo selector)
-            metascore = extraer_metascore_flexible(soup)
-            if metascore:
-                try:
-                    data['metascore'] = metascore
-                except ValueError:
-                    pass
-
-            # Actores principales (nuevo selector, más confiable)
-            actores = []
-            credit_blocks = soup.select('li[data-testid="title-pc-principal-credit"]')
-
-            for block in credit_blocks:
-                if 'Stars' in block.text:
-                    a_tags = block.select('a[href^="/name/"]')
-                    for tag in a_tags:
-                        nombre = tag.text.strip()
-                        if nombre and nombre.lower() != "see more":
-                            actores.append(nombre)
-                        if len(actores) == 3:
-                            break
-                    break
-
-            data['actores'] = actores
-            data['url'] = url
-
-            return data
+                peticion.update(proxies={"http": proxy_actual,
+                                         "https": proxy_actual},
+                                timeout=10)
+
+            # En modo streaming se deja de leer el cuerpo (y se cierra la
+            # conexión al salir del with) en cuanto están todos los campos.
+            if use_streaming:
+                peticion['tamaño_fragmento'] = TAMAÑO_FRAGMENTO
+            with abrir_pagina(url, headers, **peticion) as (status_code, contenido):
+                if status_code != 200:
+                    raise Exception(f"HTTP {status_code}")
+
+                if use_streaming:
+                    data = extraer_campos_stream(contenido)
+                else:
+                    tree = parsear_html(contenido)
+                    try:
+                        data = extraer_campos(tree)
+                    finally:
+                        # Que un traceback no mantenga vivo el árbol de la página
+                        del tree
+
+            # El dict y el árbol de la página no salen de esta función: sólo se
+            # conserva el registro compacto
+            return pelicula_desde_campos(data, url)
         except Exception as e:
             logging.warning(f"Error en la solicitud: {e}")
             intento += 1
@@ -281,66 +240,80 @@ def extraer_info_pelicula(url):
 
 def procesar_peliculas_csv(input_csv='data/enlaces_peliculas.csv',
                             output_csv='data/detalle_peliculas.csv',
-                            delay=1):
+                            delay=1,
+                            limite=None):
     """
     Lee un CSV de enlaces IMDb, extrae datos por película y guarda los resultados en un nuevo CSV.
+    Con `limite` sólo se procesan las primeras `limite` filas.
     """
     if not probar_conexion():
         return
     crear_tabla_si_no_existe()
 
-    resultados = []
-    resultados_lock = threading.Lock()
-    tareas = Queue()
+    # Con presupuesto de memoria, los hilos, la cola de enlaces y el lote de
+    # escritura se dimensionan para no pasar del techo de RSS configurado
+    n_hilos, tamaño_cola, tamaño_lote = dimensionar_memoria(presupuesto_memoria_mb, hilos_de_descarga())
+    tareas = Queue(maxsize=tamaño_cola)
+    escritor = EscritorCSV(output_csv, tamaño_lote)
 
-    with open(input_csv, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for i, fila in enumerate(reader):
-            if i >= 250:
-                break
-            tareas.put(fila['Enlace'])
+    def productor():
+        # Lee los enlaces a medida que hay lugar en la cola, sin cargar el CSV entero
+        try:
+            with open(input_csv, 'r', encoding='utf-8') as f:
+                reader = csv.DictReader(f)
+                for i, fila in enumerate(reader):
+                    if limite is not None and i >= limite:
+                        break
+                    # Si la cobertura de extracción colapsa se deja de pedir páginas
+                    if monitor_calidad.pausa.is_set():
+                        break
+                    tareas.put(fila['Enlace'])
+        except (OSError, KeyError) as e:
+            logging.error(f"Fail No se pudieron leer los enlaces de {input_csv}: {e!r}")
+        finally:
+            # Los trabajadores terminan aunque la lectura del CSV falle a mitad de camino
+            for _ in range(n_hilos):
+                tareas.put(None)
 
     def trabajador():
-        while not tareas.empty():
+        while True:
             url = tareas.get()
+            if url is None:
+                break
+            if monitor_calidad.pausa.is_set():
+                continue
             try:
                 info = extraer_info_pelicula(url)
-                info['url'] = url
-                with resultados_lock:
-                    resultados.append(info)
-                logging.info(f"Great Procesado: {info.get('titulo', 'N/A')}")
+                if info is None:
+                    logging.warning(f"Fail Sin datos válidos para {url}")
+                else:
+                    escritor.agregar(info)
+                    logging.info(f"Great Procesado: {info.titulo or 'N/A'}")
             except Exception as e:
                 logging.warning(f"Fail Error al procesar {url}: {e}")
-            tareas.task_done()
 
-    # Crear y lanzar 10 hilos
-    hilos = []
-    for _ in range(10):
-        t = threading.Thread(target=trabajador)
+    # Crear y lanzar los hilos
+    hilos = [threading.Thread(target=productor)]
+    for _ in range(n_hilos):
+        hilos.append(threading.Thread(target=trabajador))
+    for t in hilos:
         t.start()
-        hilos.append(t)
 
     for t in hilos:
         t.join()
+    escritor.cerrar()
 
-    # Guardar resultados
-    os.makedirs(os.path.dirname(output_csv), exist_ok=True)
-    with open(output_csv, 'w', newline='', encoding='utf-8') as f:
-        campos = ['titulo', 'año', 'calificacion', 'duracion_min', 'metascore', 'actores', 'url']
-        writer = csv.DictWriter(f, fieldnames=campos)
-        writer.writeheader()
-        for fila in resultados:
-            # Serializar la lista de actores como string
-            fila['actores'] = ', '.join(fila.get('actores', []))
-            writer.writerow(fila)
+    if monitor_calidad.pausa.is_set():
+        logging.error(f"Fail Descarga pausada por baja cobertura tras {monitor_calidad.resumen()['registros']} registros")
+    monitor_calidad.escribir_resumen()
 
     logging.info(f"Great Archivo generado: {output_csv}")
-    logging.info(f"Done Total de películas procesadas: {len(resultados)}")
+    logging.info(f"Done Total de películas procesadas: {escritor.total}")
+    pico = rss_pico_mb()
+    if pico is not None:
+        logging.info(f"Done Pico de memoria: {pico:.0f} MB")
 
 
-html = get_page(TOP_URL)
-debug_path = os.path.join('data', 'imdb_debug.html')
-with open(debug_path, 'w', encoding='utf-8') as f:
-    f.write(html)
-extraer_enlaces_imdb(debug_path)
-procesar_peliculas_csv()
\ No newline at end of file
+indice, rangos = rastrear_fuentes([fuente_desde_texto(fuente) for fuente in fuentes_imdb])
+guardar_enlaces(indice, rangos)
+procesar_peliculas_csv()
@@ -0,0 +1,70 @@
+import csv
+import os
+import sys
+import threading
+from collections import namedtuple
+
+# Registro compacto de una película: una tupla en vez de un dict por fila. Los
+# nombres de actores se internan, así cada actor se guarda una sola vez en
+# memoria aunque aparezca en muchas películas.
+Pelicula = namedtuple(
+    'Pelicula',
+    ['titulo', 'año', 'calificacion', 'duracion_min', 'metascore', 'actores', 'url'],
+    defaults=(None, None, None, None, None, (), None),
+)
+
+COLUMNAS_CSV = list(Pelicula._fields)
+
+
+def pelicula_desde_campos(data, url):
+    """
+    Construye una Pelicula a partir del dict que devuelven los extractores.
+    """
+    actores = tuple(sys.intern(actor) for actor in data.get('actores', ()))
+    return Pelicula(
+        titulo=data.get('titulo'),
+        año=data.get('año'),
+        calificacion=data.get('calificacion'),
+        duracion_min=data.get('duracion_min'),
+        metascore=data.get('metascore'),
+        actores=actores,
+        url=url,
+    )
+
+
+class EscritorCSV:
+    """
+    Escribe películas en el CSV de detalle por lotes de `tamaño_lote`, para no
+    acumular todos los registros en memoria hasta el final de la ejecución.
+    """
+
+    def __init__(self, output_csv, tamaño_lote=500):
+        self.output_csv = output_csv
+        self.tamaño_lote = tamaño_lote
+        self.total = 0
+        self._lote = []
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(output_csv) or '.', exist_ok=True)
+        with open(output_csv, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerow(COLUMNAS_CSV)
+
+    def agregar(self, pelicula):
+        with self._lock:
+            self._lote.append(pelicula)
+            self.total += 1
+            if len(self._lote) >= self.tamaño_lote:
+                self._volcar()
+
+    def cerrar(self):
+        with self._lock:
+            self._volcar()
+
+    def _volcar(self):
+        if not self._lote:
+            return
+        with open(self.output_csv, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            for pelicula in self._lote:
+                # Serializar la lista de actores como string
+                writer.writerow(pelicula._replace(actores=', '.join(pelicula.actores)))
+        self._lote.clear()
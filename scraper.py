@@ -1,13 +1,23 @@
 import csv
 import logging
+import mmap
 import os
+import threading
 import time
+from contextlib import contextmanager
 
 import requests
 from bs4 import BeautifulSoup
 import random
 import re
 
+from config import use_http2
+
+try:
+    import httpx
+except ImportError:  # httpx[http2] es opcional: sin él todo va por HTTP/1.1
+    httpx = None
+
 USER_AGENTS = [
     # Chrome en Windows
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
@@ -21,6 +31,26 @@ USER_AGENTS = [
 
 ]
 TOP_URL = "https://www.imdb.com/chart/top/"
+# IMDb sirve todo en UTF-8; declararlo evita la detección de charset de requests
+CODIFICACION = 'utf-8'
+# Se buscan sobre los bytes crudos para no decodificar ni copiar la página
+RE_BLOQUEO = re.compile(rb'unusual traffic|(?i:captcha)')
+RE_ID_TITULO = re.compile(rb'"url":"https://www\.imdb\.com/title/tt(\d+)/"')
+RE_HREF_TITULO = re.compile(rb'href="/title/tt(\d+)/')
+URL_TITULO = "https://www.imdb.com/title/tt{:07d}/"
+# Transporte HTTP/2: pocas conexiones a www.imdb.com con muchas peticiones
+# multiplexadas en cada una, acotadas por un semáforo de streams en vuelo. El
+# tope queda por debajo del SETTINGS_MAX_CONCURRENT_STREAMS habitual (100): al
+# llegar a ese límite el servidor puede cortar la conexión con todos sus streams.
+MAX_CONEXIONES_HTTP2 = 2
+MAX_STREAMS_HTTP2 = 50
+_streams_http2 = threading.BoundedSemaphore(MAX_STREAMS_HTTP2)
+_cliente_http2 = None
+_cliente_http2_lock = threading.Lock()
+# Se activa en tiempo de ejecución si use_http2 está pedido pero falta httpx/h2
+_http2_no_disponible = False
+
+ERRORES_RED = (requests.exceptions.RequestException,) + ((httpx.HTTPError,) if httpx else ())
 os.makedirs('data', exist_ok=True)
 
 
@@ -44,23 +74,106 @@ def get_headers():
     }
 
 
-def get_page(url, max_retries=3, delay=1):
-    for attempt in range(1, max_retries + 1):
+def cliente_http2():
+    """
+    Devuelve el cliente HTTP/2 compartido, creándolo la primera vez. Devuelve
+    None si HTTP/2 está desactivado o si httpx/h2 no están instalados.
+    """
+    global _cliente_http2, _http2_no_disponible
+    if not use_http2 or _http2_no_disponible:
+        return None
+    with _cliente_http2_lock:
+        if _cliente_http2 is None and not _http2_no_disponible:
+            try:
+                if httpx is None:
+                    raise ImportError("httpx no está instalado")
+                # requests sigue las redirecciones; httpx no, salvo que se pida
+                _cliente_http2 = httpx.Client(
+                    http2=True,
+                    follow_redirects=True,
+                    limits=httpx.Limits(max_connections=MAX_CONEXIONES_HTTP2,
+                                        max_keepalive_connections=MAX_CONEXIONES_HTTP2),
+                )
+            except ImportError:  # falta httpx o el paquete h2
+                logging.warning("HTTP/2 no disponible (pip install 'httpx[http2]'), se usa HTTP/1.1")
+                _http2_no_disponible = True
+    return _cliente_http2
+
+
+def _enviar_http2(cliente, url, headers, timeout):
+    """
+    Envía un GET por el cliente HTTP/2 sin leer el cuerpo. Si el servidor cierra
+    la conexión (GOAWAY, p. ej. al llegar a su máximo de peticiones por conexión)
+    antes de responder, se reintenta una vez: el pool abre una conexión nueva.
+    """
+    request = cliente.build_request('GET', url, headers=headers, timeout=timeout)
+    try:
+        return cliente.send(request, stream=True)
+    except httpx.RemoteProtocolError as e:
+        logging.warning(f"Conexión HTTP/2 cerrada por el servidor ({e}), se reintenta {url}")
+        return cliente.send(request, stream=True)
+
+
+@contextmanager
+def abrir_pagina(url, headers, proxies=None, timeout=None, tamaño_fragmento=None):
+    """
+    Hace un GET y entrega (status_code, contenido). Sin `tamaño_fragmento` el
+    contenido son los bytes completos; con él, un iterador de fragmentos de bytes
+    que se puede abandonar antes del final.
+
+    Usa el cliente HTTP/2 compartido cuando está activo; con proxies se usa
+    siempre requests (HTTP/1.1), ya que la mayoría no soporta HTTP/2.
+    """
+    cliente = cliente_http2() if not proxies else None
+    if cliente is None:
+        with requests.get(url, headers=headers, proxies=proxies, timeout=timeout,
+                          stream=tamaño_fragmento is not None) as response:
+            if tamaño_fragmento is None:
+                yield response.status_code, response.content
+            else:
+                yield response.status_code, response.iter_content(tamaño_fragmento)
+        return
+
+    with _streams_http2:
+        response = _enviar_http2(cliente, url, headers, timeout)
         try:
-            response = requests.get(url, headers=get_headers(), timeout=10)
-            if response.status_code in {200, 201, 202}:
-                content = response.text
+            if tamaño_fragmento is None:
+                yield response.status_code, response.read()
+            else:
+                yield response.status_code, response.iter_bytes(tamaño_fragmento)
+        finally:
+            response.close()
+
+
+def descargar(url, headers, proxies=None, timeout=None):
+    """
+    Como abrir_pagina, pero devuelve (status_code, bytes) con la conexión ya liberada.
+    """
+    with abrir_pagina(url, headers, proxies=proxies, timeout=timeout) as (status_code, content):
+        return status_code, content
 
+
+def get_page(url, max_retries=3, delay=1, binario=False):
+    """
+    Descarga una página con reintentos. Con `binario=True` devuelve los bytes
+    crudos de la respuesta sin decodificarlos.
+    """
+    for attempt in range(1, max_retries + 1):
+        try:
+            status_code, content = descargar(url, get_headers(), timeout=10)
+            if status_code in {200, 201, 202}:
                 # Detección de bloqueo tipo CAPTCHA o tráfico inusual
-                if "unusual traffic" in content or "captcha" in content.lower():
+                if RE_BLOQUEO.search(content):
                     logging.warning(f"[{attempt}] Posible bloqueo por tráfico inusual en {url}")
                     time.sleep(delay)
                     continue
 
-                return content
+                if binario:
+                    return content
+                return content.decode(CODIFICACION, errors='replace')
             else:
-                logging.warning(f"[{attempt}] Error HTTP {response.status_code} al acceder a {url}")
-        except (requests.exceptions.RequestException, requests.exceptions.Timeout) as e:
+                logging.warning(f"[{attempt}] Error HTTP {status_code} al acceder a {url}")
+        except ERRORES_RED as e:
             logging.warning(f"[{attempt}] Excepción al acceder a {url}: {e}")
 
         time.sleep(delay)
@@ -69,30 +182,42 @@ def get_page(url, max_retries=3, delay=1):
     return None
 
 
-def extraer_enlaces_imdb(html_path, output_csv_path='data/enlaces_peliculas.csv'):
+def extraer_ids_titulos(content):
     """
-    Extrae enlaces de películas desde un archivo HTML de IMDb y los guarda con su posición en un CSV.
+    Devuelve los IDs numéricos de los títulos de una página de IMDb (bytes), en
+    orden y sin duplicados. Usa el JSON-LD de charts y listas y, si la página no
+    lo tiene (búsquedas por género), los enlaces /title/ttNNN/ del HTML.
     """
-    # Cargar el archivo HTML
-    with open(html_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    ids = RE_ID_TITULO.findall(content) or RE_HREF_TITULO.findall(content)
+    return list(dict.fromkeys(int(tt) for tt in ids))
+
 
-    # Buscar todos los enlaces de películas
-    urls = re.findall(r'"url":"(https://www\.imdb\.com/title/tt\d+/)"', content)
+def extraer_enlaces_imdb(html_path, output_csv_path='data/enlaces_peliculas.csv'):
+    """
+    Extrae enlaces de películas desde un archivo HTML de IMDb y los guarda con su posición en un CSV.
 
-    # Eliminar duplicados manteniendo el orden
-    urls = list(dict.fromkeys(urls))
+    El pipeline ya no guarda el chart en disco (ver fuentes.rastrear_fuentes);
+    esta función queda para procesar páginas guardadas a mano y usa la misma
+    extracción de IDs que las fuentes.
+    """
+    # Buscar los IDs directamente sobre el archivo mapeado en memoria, sin
+    # leerlo ni decodificarlo completo
+    ids = []
+    with open(html_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                ids = extraer_ids_titulos(content)
 
     # Guardar en CSV
     os.makedirs(os.path.dirname(output_csv_path), exist_ok=True)
     with open(output_csv_path, 'w', newline='', encoding='utf-8') as csvfile:
         writer = csv.writer(csvfile)
         writer.writerow(['Posición', 'Enlace'])
-        for i, url in enumerate(urls, start=1):
-            writer.writerow([i, url])
+        for i, tt in enumerate(ids, start=1):
+            writer.writerow([i, URL_TITULO.format(tt)])
 
-    print(f"Se guardaron {len(urls)} enlaces en '{output_csv_path}'")
-    return len(urls)
+    print(f"Se guardaron {len(ids)} enlaces en '{output_csv_path}'")
+    return len(ids)
 
 
 def extraer_info_pelicula(url):
@@ -102,7 +227,7 @@ def extraer_info_pelicula(url):
     """
     headers = get_headers()
     response = requests.get(url, headers=headers)
-    soup = BeautifulSoup(response.text, 'html.parser')
+    soup = BeautifulSoup(response.content, 'html.parser', from_encoding=CODIFICACION)
 
     data = {}
 
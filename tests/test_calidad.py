@@ -0,0 +1,118 @@
+import json
+import os
+import tempfile
+
+from calidad import MonitorCobertura
+from registros import Pelicula
+
+
+def registro(**cambios):
+    pelicula = Pelicula(
+        titulo='The Shawshank Redemption',
+        año=1994,
+        calificacion=9.3,
+        duracion_min=142,
+        metascore=82,
+        actores=('Tim Robbins', 'Morgan Freeman', 'Bob Gunton'),
+        url='https://www.imdb.com/title/tt0111161/',
+    )
+    return pelicula._replace(**cambios)
+
+
+def test_registro_completo_es_valido():
+    monitor = MonitorCobertura(ventana=4)
+
+    assert monitor.registrar(registro())[1]
+    assert all(tasa == 1.0 for tasa in monitor.tasas_ventana().values())
+
+
+def test_metascore_cero_y_opcional():
+    """Un metascore 0 cuenta como lleno y su ausencia no invalida el registro."""
+    monitor = MonitorCobertura(ventana=2)
+
+    assert monitor.registrar(registro(metascore=0)) == (registro(metascore=0), True)
+    assert monitor.registrar(registro(metascore=None))[1]
+    assert monitor.tasas_ventana()['metascore'] == 0.5
+
+
+def test_valor_fuera_de_rango_se_descarta():
+    monitor = MonitorCobertura(ventana=4)
+
+    pelicula, valido = monitor.registrar(registro(calificacion=93.0))
+
+    assert valido
+    assert pelicula.calificacion is None
+    assert monitor.tasas_ventana()['calificacion'] == 0.0
+
+
+def test_sin_titulo_se_rechaza():
+    monitor = MonitorCobertura(ventana=4)
+
+    assert not monitor.registrar(registro(titulo=''))[1]
+    assert monitor.resumen()['rechazados'] == 1
+
+
+def test_titulo_sin_calificacion_se_guarda():
+    """Un título aún sin votos se guarda; la calificación sólo cuenta para la cobertura."""
+    monitor = MonitorCobertura(ventana=4)
+
+    assert monitor.registrar(registro(calificacion=None, año=None))[1]
+    assert monitor.resumen()['rechazados'] == 0
+
+
+def test_fallo_de_descarga_no_entra_en_la_ventana():
+    monitor = MonitorCobertura(ventana=2, umbral=0.5)
+    for _ in range(5):
+        monitor.registrar_fallo()
+    monitor.registrar(registro())
+
+    assert monitor.tasas_ventana()['titulo'] == 1.0
+    assert not monitor.pausa.is_set()
+    assert monitor.resumen()['fallos_descarga'] == 5
+    assert monitor.resumen()['registros'] == 1
+
+
+def test_ventana_deslizante_olvida_registros_viejos():
+    monitor = MonitorCobertura(ventana=3, umbral=0.0)
+    monitor.registrar(registro(año=None))
+    for _ in range(3):
+        monitor.registrar(registro())
+
+    assert monitor.tasas_ventana()['año'] == 1.0
+    assert monitor.resumen()['cobertura']['año'] == 0.75
+
+
+def test_pausa_cuando_colapsa_la_cobertura():
+    """La pausa sólo se activa con la ventana llena y un campo crítico bajo el umbral."""
+    monitor = MonitorCobertura(ventana=4, umbral=0.5)
+    for _ in range(3):
+        monitor.registrar(registro(año=None))
+    assert not monitor.pausa.is_set()
+
+    monitor.registrar(registro(año=None))
+
+    assert monitor.pausa.is_set()
+
+
+def test_campo_no_critico_no_pausa():
+    monitor = MonitorCobertura(ventana=4, umbral=0.5)
+    for _ in range(8):
+        monitor.registrar(registro(metascore=None, actores=()))
+
+    assert not monitor.pausa.is_set()
+
+
+def test_escribir_resumen():
+    monitor = MonitorCobertura(ventana=2)
+    monitor.registrar(registro())
+    monitor.registrar(registro(duracion_min=None))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'cobertura.json')
+        monitor.escribir_resumen(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            resumen = json.load(f)
+
+    assert resumen['registros'] == 2
+    assert resumen['pausado'] is False
+    assert resumen['cobertura']['duracion_min'] == 0.5
@@ -0,0 +1,142 @@
+import os
+
+import pytest
+from lxml.html import fromstring
+
+from extractores import CAMPOS, extraer_campos, extraer_campos_stream, parsear_html, resolver_campo
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'titulo_tt0111161.html')
+
+
+@pytest.fixture
+def contenido():
+    with open(FIXTURE, 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture
+def tree(contenido):
+    return fromstring(contenido)
+
+
+def fragmentar(contenido, tamaño, consumidos=None):
+    for inicio in range(0, len(contenido), tamaño):
+        if consumidos is not None:
+            consumidos.append(inicio + tamaño)
+        yield contenido[inicio:inicio + tamaño]
+
+
+def test_extraer_campos_ficha_completa(tree):
+    """Extrae todos los campos de una ficha con el marcado actual de IMDb."""
+    data = extraer_campos(tree)
+
+    assert data == {
+        'titulo': 'The Shawshank Redemption',
+        'año': 1994,
+        'calificacion': 9.3,
+        'duracion_min': 142,
+        'metascore': 82,
+        'actores': ['Tim Robbins', 'Morgan Freeman', 'Bob Gunton'],
+    }
+
+
+def test_año_usa_fallback_si_cambia_la_ruta_absoluta(tree):
+    """Si la ruta absoluta deja de existir, el año sale del enlace releaseinfo."""
+    bloque = tree.xpath('//div[@class="sc-aside"]')[0]
+    bloque.getparent().remove(bloque)
+
+    valor, elemento = resolver_campo(CAMPOS['año'], tree)
+
+    assert valor == 1994
+    assert 'releaseinfo' in elemento.get('href')
+
+
+def test_metascore_anclado_en_etiqueta():
+    """Sin la caja de Metacritic se usa el span numérico del <li> de Metascore."""
+    tree = fromstring('''
+    <html><body><section><ul>
+      <li><span>11K</span><span>User reviews</span></li>
+      <li><span><span>74</span></span><span>Metascore</span></li>
+    </ul></section></body></html>
+    ''')
+
+    assert extraer_campos(tree)['metascore'] == 74
+
+
+def test_metascore_cero_es_valido():
+    """Un metascore de 0 es un valor válido y no se descarta."""
+    tree = fromstring('<html><body><span class="metacritic-score-box">0</span></body></html>')
+
+    assert extraer_campos(tree)['metascore'] == 0
+
+
+def test_duracion_solo_minutos():
+    """La duración acepta fichas sin horas."""
+    tree = fromstring('<html><body><ul><li data-testid="title-techspec_runtime">'
+                      '<span>Runtime</span><div>58m</div></li></ul></body></html>')
+
+    assert extraer_campos(tree)['duracion_min'] == 58
+
+
+def test_extraer_campos_pagina_vacia():
+    """Una página sin marcado de ficha sólo devuelve la lista de actores vacía."""
+    tree = fromstring('<html><body><p>Sin datos</p></body></html>')
+
+    assert extraer_campos(tree) == {'actores': []}
+
+
+def test_parsear_html_bytes_utf8_sin_meta_charset():
+    """Los bytes se decodifican como UTF-8 aunque la página no declare charset."""
+    tree = parsear_html('<html><body><h1>Le fabuleux destin d\'Amélie Poulain</h1></body></html>'.encode('utf-8'))
+
+    assert extraer_campos(tree)['titulo'] == "Le fabuleux destin d'Amélie Poulain"
+
+
+def test_stream_bytes_utf8_sin_meta_charset():
+    """El parser incremental también usa la codificación declarada."""
+    contenido = '<html><body><h1>Amélie</h1><p>fin</p></body></html>'.encode('utf-8')
+
+    assert extraer_campos_stream(fragmentar(contenido, 5))['titulo'] == 'Amélie'
+
+
+@pytest.mark.parametrize("tamaño", [1, 7, 64, 1024, 1 << 20])
+def test_stream_equivale_a_pagina_completa(contenido, tamaño):
+    """El resultado en streaming no depende de dónde se corten los fragmentos."""
+    data = extraer_campos_stream(fragmentar(contenido, tamaño))
+
+    assert data == extraer_campos(fromstring(contenido))
+
+
+def test_stream_termina_antes_del_final(contenido):
+    """Deja de leer fragmentos en cuanto todos los campos están resueltos."""
+    relleno = b'<script>' + b'x' * 100_000 + b'</script></body>'
+    contenido = contenido.replace(b'</body>', relleno, 1)
+    consumidos = []
+
+    data = extraer_campos_stream(fragmentar(contenido, 1024, consumidos))
+
+    assert data['duracion_min'] == 142
+    assert consumidos[-1] < len(contenido) // 2
+
+
+def test_stream_usa_fallback_al_terminar_el_documento():
+    """Si falta el selector principal, el respaldo se evalúa con el documento completo."""
+    contenido = (b'<html><body><section><ul><li><span>74</span><span>Metascore</span></li>'
+                 b'</ul></section></body></html>')
+
+    data = extraer_campos_stream(fragmentar(contenido, 16))
+
+    assert data == {'metascore': 74, 'actores': []}
+
+
+def test_stream_sin_metascore_termina_en_especificaciones(contenido):
+    """Sin metascore deja de leer al cerrarse la sección de especificaciones técnicas."""
+    contenido = contenido.replace(b'<span class="sc-meta metacritic-score-box">82</span>', b'', 1)
+    contenido = contenido.replace(b'</body>', b'<script>' + b'x' * 100_000 + b'</script></body>', 1)
+    consumidos = []
+
+    data = extraer_campos_stream(fragmentar(contenido, 1024, consumidos))
+
+    assert 'metascore' not in data
+    assert data == extraer_campos(fromstring(contenido))
+    assert consumidos[-1] < len(contenido) // 2
@@ -0,0 +1,106 @@
+import csv
+import os
+import tempfile
+
+import pytest
+
+import fuentes
+from fuentes import (FUENTES, Fuente, IndiceTitulos, fuente_desde_texto, guardar_enlaces,
+                     rastrear_fuente, rastrear_fuentes)
+from scraper import extraer_ids_titulos
+
+
+def pagina_jsonld(*ids):
+    return ''.join(f'{{"@type":"ListItem","url":"https://www.imdb.com/title/tt{tt:07d}/"}},'
+                   for tt in ids).encode('utf-8')
+
+
+@pytest.fixture
+def paginas(monkeypatch):
+    """Simula get_page con un diccionario url -> contenido."""
+    contenidos = {}
+    monkeypatch.setattr(fuentes, 'get_page', lambda url, binario=False: contenidos.get(url))
+    return contenidos
+
+
+def test_indice_titulos_deduplica():
+    indice = IndiceTitulos()
+
+    assert indice.agregar(111161)
+    assert indice.agregar(10872600)
+    assert not indice.agregar(111161)
+    assert 111161 in indice
+    assert 68646 not in indice
+    assert 99999999 not in indice
+    assert list(indice.orden) == [111161, 10872600]
+    assert len(indice) == 2
+
+
+def test_extraer_ids_titulos_jsonld():
+    assert extraer_ids_titulos(pagina_jsonld(111161, 68646, 111161)) == [111161, 68646]
+
+
+def test_extraer_ids_titulos_fallback_href():
+    """Las páginas sin JSON-LD usan los enlaces /title/ del HTML."""
+    content = b'<a href="/title/tt0111161/?ref_=sr_t_1">x</a><a href="/title/tt0068646/">y</a>'
+
+    assert extraer_ids_titulos(content) == [111161, 68646]
+
+
+def test_fuente_desde_texto():
+    assert fuente_desde_texto('top250') is FUENTES['top250']
+    assert fuente_desde_texto('lista:ls055592025').url_pagina(2) == \
+        "https://www.imdb.com/list/ls055592025/?page=2"
+    assert 'start=51' in fuente_desde_texto('genero:horror').url_pagina(2)
+    with pytest.raises(ValueError):
+        fuente_desde_texto('desconocida:')
+
+
+def test_rastrear_fuente_paginada(paginas):
+    """La paginación se corta cuando una página no aporta títulos nuevos."""
+    fuente = Fuente('lista:ls1', lambda n: f"https://imdb.test/ls1?page={n}", 10)
+    paginas["https://imdb.test/ls1?page=1"] = pagina_jsonld(1, 2)
+    paginas["https://imdb.test/ls1?page=2"] = pagina_jsonld(3)
+    paginas["https://imdb.test/ls1?page=3"] = pagina_jsonld(3)
+
+    assert list(rastrear_fuente(fuente)) == [1, 2, 3]
+
+
+def test_rastrear_fuentes_fusiona_y_conserva_rangos(paginas):
+    top = Fuente('top', lambda n: "https://imdb.test/top", 1)
+    populares = Fuente('populares', lambda n: "https://imdb.test/pop", 1)
+    paginas["https://imdb.test/top"] = pagina_jsonld(10, 20, 30)
+    paginas["https://imdb.test/pop"] = pagina_jsonld(40, 20)
+
+    indice, rangos = rastrear_fuentes([top, populares])
+
+    assert list(indice.orden) == [10, 20, 30, 40]
+    assert list(rangos['populares']) == [40, 20]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        csv_path = os.path.join(tmpdir, 'enlaces_peliculas.csv')
+        total = guardar_enlaces(indice, rangos, csv_path)
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            reader = list(csv.reader(f))
+
+    assert total == 4
+    assert reader[0] == ['Posición', 'Enlace', 'Fuentes']
+    assert reader[2] == ['2', 'https://www.imdb.com/title/tt0000020/', 'top:2;populares:2']
+    assert reader[4] == ['4', 'https://www.imdb.com/title/tt0000040/', 'populares:1']
+
+
+def test_rastrear_fuentes_ignora_fuentes_repetidas(paginas):
+    """Una fuente configurada dos veces no pisa sus rangos ni se descarga dos veces."""
+    paginas["https://imdb.test/top"] = pagina_jsonld(10, 20)
+    descargas = []
+
+    def url_pagina(n):
+        descargas.append(n)
+        return "https://imdb.test/top"
+
+    indice, rangos = rastrear_fuentes([Fuente('top', url_pagina, 1), Fuente('top', url_pagina, 1)])
+
+    assert list(indice.orden) == [10, 20]
+    assert list(rangos) == ['top']
+    assert list(rangos['top']) == [10, 20]
+    assert descargas == [1]
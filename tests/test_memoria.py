@@ -0,0 +1,22 @@
+from memoria import dimensionar_memoria
+
+
+def test_dimensionar_memoria_sin_presupuesto():
+    assert dimensionar_memoria(None, 10) == (10, 0, 500)
+
+
+def test_dimensionar_memoria_reduce_hilos():
+    hilos, tamaño_cola, tamaño_lote = dimensionar_memoria(80, 10)
+
+    assert hilos < 10
+    assert tamaño_cola >= hilos
+    assert tamaño_lote >= 50
+
+
+def test_dimensionar_memoria_crece_con_el_presupuesto():
+    assert dimensionar_memoria(64, 1) == (1, 4, 50)
+
+    _, tamaño_cola, tamaño_lote = dimensionar_memoria(72, 1)
+
+    assert 4 < tamaño_cola <= 10_000
+    assert 50 < tamaño_lote <= 5_000
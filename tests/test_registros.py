@@ -0,0 +1,44 @@
+import csv
+import os
+import tempfile
+
+from registros import EscritorCSV, Pelicula, pelicula_desde_campos
+
+
+def test_pelicula_desde_campos():
+    data = {'titulo': 'The Shawshank Redemption', 'año': 1994, 'actores': ['Tim Robbins', 'Morgan Freeman']}
+
+    pelicula = pelicula_desde_campos(data, 'https://www.imdb.com/title/tt0111161/')
+
+    assert pelicula == Pelicula(titulo='The Shawshank Redemption', año=1994,
+                                actores=('Tim Robbins', 'Morgan Freeman'),
+                                url='https://www.imdb.com/title/tt0111161/')
+
+
+def test_pelicula_desde_campos_interna_actores():
+    """El mismo actor en dos películas es el mismo objeto str."""
+    nombre = ''.join(['Morgan ', 'Freeman'])
+    a = pelicula_desde_campos({'actores': [nombre]}, 'a')
+    b = pelicula_desde_campos({'actores': [''.join(['Morgan ', 'Freeman'])]}, 'b')
+
+    assert a.actores[0] is b.actores[0]
+
+
+def test_escritor_csv_por_lotes():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        csv_path = os.path.join(tmpdir, 'detalle_peliculas.csv')
+        escritor = EscritorCSV(csv_path, tamaño_lote=2)
+
+        for i in range(3):
+            escritor.agregar(Pelicula(titulo=f'Película {i}', año=2000 + i, actores=('A', 'B'), url=f'u{i}'))
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            antes_de_cerrar = list(csv.reader(f))
+        escritor.cerrar()
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            filas = list(csv.reader(f))
+
+    assert len(antes_de_cerrar) == 3  # encabezado + primer lote
+    assert escritor.total == 3
+    assert filas[0] == ['titulo', 'año', 'calificacion', 'duracion_min', 'metascore', 'actores', 'url']
+    assert filas[3] == ['Película 2', '2002', '', '', '', 'A, B', 'u2']
+
@@ -7,7 +7,8 @@ import pytest
 import requests
 import logging
 from unittest.mock import patch
-from scraper import get_headers, get_page, USER_AGENTS, extraer_enlaces_imdb
+import scraper
+from scraper import get_headers, get_page, USER_AGENTS, extraer_enlaces_imdb, abrir_pagina, cliente_http2
 import responses
 
 # Configurar path
@@ -121,6 +122,33 @@ def test_get_page_blocked_detection():
         assert len(rsps.calls) == 3
 
 
+def test_get_page_binario():
+    """Comprueba que get_page(binario=True) devuelve los bytes
+    crudos sin decodificar."""
+    test_url = "https://test-binario.com"
+    test_content = "<html>Amélie</html>".encode('utf-8')
+
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.GET, test_url, body=test_content, status=200)
+
+        result = get_page(test_url, binario=True)
+
+        assert result == test_content
+
+
+def test_get_page_blocked_detection_mayusculas():
+    """Valida que la detección de CAPTCHA sobre bytes no
+    distingue mayúsculas."""
+    test_url = "https://test-blocked-captcha.com"
+
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.GET, test_url, body="<h1>Please solve this CAPTCHA</h1>", status=200)
+
+        result = get_page(test_url, max_retries=1, delay=0)
+
+        assert result is None
+
+
 def test_get_page_timeout():
     """Prueba que get_page() maneja correctamente errores de
      timeout en conexiones."""
@@ -276,3 +304,121 @@ def test_extraer_enlaces_imdb_sin_resultados():
         assert reader[0] == ['Posición', 'Enlace']
 
 
+def test_extraer_enlaces_imdb_archivo_vacio():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        html_path = os.path.join(tmpdir, 'vacio.html')
+        csv_path = os.path.join(tmpdir, 'enlaces_peliculas.csv')
+        open(html_path, 'wb').close()
+
+        total = extraer_enlaces_imdb(html_path, csv_path)
+
+        assert total == 0
+
+
+@pytest.fixture
+def http2_simulado(monkeypatch):
+    """Activa HTTP/2 con un cliente httpx que responde localmente."""
+    httpx = pytest.importorskip("httpx")
+    peticiones = []
+
+    def responder(request):
+        peticiones.append(request)
+        return httpx.Response(200, content=b"<html>" + b"h2" * 1000 + b"</html>")
+
+    monkeypatch.setattr(scraper, "use_http2", True)
+    monkeypatch.setattr(scraper, "_cliente_http2", httpx.Client(transport=httpx.MockTransport(responder)))
+    return peticiones
+
+
+def test_cliente_http2_desactivado(monkeypatch):
+    monkeypatch.setattr(scraper, "use_http2", False)
+
+    assert cliente_http2() is None
+
+
+def test_cliente_http2_sin_httpx(monkeypatch):
+    """Sin httpx instalado se desactiva HTTP/2 sin tocar la configuración."""
+    monkeypatch.setattr(scraper, "use_http2", True)
+    monkeypatch.setattr(scraper, "httpx", None)
+    monkeypatch.setattr(scraper, "_cliente_http2", None)
+    monkeypatch.setattr(scraper, "_http2_no_disponible", False)
+
+    assert cliente_http2() is None
+    assert scraper._http2_no_disponible
+    assert scraper.use_http2
+
+
+def test_cliente_http2_sigue_redirecciones(monkeypatch):
+    """Como requests, el cliente HTTP/2 sigue los 301 de IDs tt fusionados."""
+    httpx = pytest.importorskip("httpx")
+
+    def responder(request):
+        if request.url.path == "/title/tt0000001/":
+            return httpx.Response(301, headers={"Location": "https://www.imdb.com/title/tt0111161/"})
+        return httpx.Response(200, content=b"<html>ok</html>")
+
+    cliente_real = httpx.Client
+    monkeypatch.setattr(httpx, "Client",
+                        lambda **kwargs: cliente_real(transport=httpx.MockTransport(responder), **kwargs))
+    monkeypatch.setattr(scraper, "use_http2", True)
+    monkeypatch.setattr(scraper, "_cliente_http2", None)
+    monkeypatch.setattr(scraper, "_http2_no_disponible", False)
+
+    try:
+        assert get_page("https://www.imdb.com/title/tt0000001/") == "<html>ok</html>"
+    finally:
+        scraper._cliente_http2.close()
+
+
+def test_get_page_http2(http2_simulado):
+    """Con HTTP/2 activo get_page usa el cliente compartido y
+    envía los headers rotativos."""
+    result = get_page("https://www.imdb.com/chart/top/")
+
+    assert result.startswith("<html>h2h2")
+    assert len(http2_simulado) == 1
+    assert http2_simulado[0].headers['User-Agent'] in USER_AGENTS
+
+
+def test_abrir_pagina_http2_por_fragmentos(http2_simulado):
+    with abrir_pagina("https://www.imdb.com/title/tt0111161/", get_headers(),
+                      tamaño_fragmento=512) as (status_code, contenido):
+        fragmentos = list(contenido)
+
+    assert status_code == 200
+    assert all(len(fragmento) == 512 for fragmento in fragmentos[:-1])
+    assert b"".join(fragmentos).endswith(b"</html>")
+
+
+def test_abrir_pagina_http2_reintenta_si_el_servidor_cierra_la_conexion(monkeypatch):
+    """Un GOAWAY antes de la respuesta se reintenta en lugar de fallar la descarga."""
+    httpx = pytest.importorskip("httpx")
+    intentos = []
+
+    def responder(request):
+        intentos.append(request)
+        if len(intentos) == 1:
+            raise httpx.RemoteProtocolError("<ConnectionTerminated error_code:0>", request=request)
+        return httpx.Response(200, content=b"<html>ok</html>")
+
+    monkeypatch.setattr(scraper, "use_http2", True)
+    monkeypatch.setattr(scraper, "_cliente_http2", httpx.Client(transport=httpx.MockTransport(responder)))
+
+    with abrir_pagina("https://www.imdb.com/title/tt0111161/", get_headers()) as (status_code, contenido):
+        assert (status_code, contenido) == (200, b"<html>ok</html>")
+    assert len(intentos) == 2
+
+
+def test_abrir_pagina_con_proxy_usa_http11(http2_simulado):
+    """Con proxy la petición va por requests aunque HTTP/2 esté activo."""
+    test_url = "https://www.imdb.com/title/tt0068646/"
+
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.GET, test_url, body="http1", status=200)
+
+        with abrir_pagina(test_url, get_headers(),
+                          proxies={"http": "http://1.2.3.4:80", "https": "http://1.2.3.4:80"}) as (status_code, contenido):
+            assert contenido == b"http1"
+
+        assert len(rsps.calls) == 1
+    assert http2_simulado == []